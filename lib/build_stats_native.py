@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Builds lib/stats_native, an ahead-of-time compiled copy of stats_kernels.
+
+stats.py is started once per comparison from the shell scripts, so the
+Numba JIT would recompile (or reload) its kernel on every run. The
+extension built here only needs NumPy at runtime and is picked up
+automatically by stats.py when present. Run via `make native`.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, LIB_DIR)
+
+import stats_kernels  # noqa: E402
+
+def build():
+    cc = CC("stats_native")
+    cc.output_dir = LIB_DIR
+    # The extension is built on the machine that runs the benchmarks
+    cc.target_cpu = "host"
+    cc.export("moments4", "f8[:](f8[:])")(stats_kernels.moments4.py_func)
+    cc.compile()
+    print(f"Built stats_native in {LIB_DIR}")
+
+if __name__ == "__main__":
+    build()
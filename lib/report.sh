@@ -112,22 +112,44 @@ This report details the statistical hypothesis tests performed to compare the pe
 ## Comparison Results
 EOF_INNER
 
+    # Gather every scenario with a baseline, then run all comparisons in a
+    # single Python process (one NDJSON line per comparison)
+    local -A baseline_values=()
+    local batch_input=""
     for scenario in "${!SCENARIOS[@]}"; do
         local baseline_file
         baseline_file=$(load_latest_baseline "$scenario")
-        if [[ -z "$baseline_file" ]]; then
+        [[ -z "$baseline_file" ]] && continue
+        
+        baseline_values[$scenario]=$(load_baseline_data "$baseline_file" 2)
+        read -ra baseline_array <<< "${baseline_values[$scenario]}"
+        read -ra candidate_array <<< "${RPS_VALUES[$scenario]}"
+        # Each side is sent as one JSON string of the raw tokens, which
+        # stats.py parses like its other CLI input; tokens such as .5 or 007
+        # are not valid JSON numbers
+        local v1="${baseline_array[*]}" v2="${candidate_array[*]}"
+        v1=${v1//\\/\\\\}; v1=${v1//\"/\\\"}
+        v2=${v2//\\/\\\\}; v2=${v2//\"/\\\"}
+        batch_input+=$(printf '{"v1": "%s", "v2": "%s"}' "$v1" "$v2")$'\n'
+    done
+    
+    local -a batch_output=()
+    if [[ -n "$batch_input" ]]; then
+        mapfile -t batch_output < <(printf "%s" "$batch_input" | "$STATS_PY" hypothesis_test_batch)
+    fi
+    
+    local batch_index=0
+    for scenario in "${!SCENARIOS[@]}"; do
+        if [[ -z "${baseline_values[$scenario]+set}" ]]; then
             echo "### $scenario (No baseline found)" >> "$COMPARISON_REPORT"
             continue
         fi
         
-        local baseline_rps
-        baseline_rps=$(load_baseline_data "$baseline_file" 2)
-        read -ra baseline_array <<< "$baseline_rps"
+        read -ra baseline_array <<< "${baseline_values[$scenario]}"
         read -ra candidate_array <<< "${RPS_VALUES[$scenario]}"
         
-        # Calling Python hypothesis_test once and getting all metrics
-        local output
-        output=$( { printf "%s\n" "${baseline_array[@]}"; echo "---"; printf "%s\n" "${candidate_array[@]}"; } | "$STATS_PY" hypothesis_test )
+        local output="${batch_output[batch_index]:-}"
+        batch_index=$((batch_index + 1))
         
         IFS='|' read -r test_used _ _ p_value _ effect b_norm c_norm <<< "$output" # stat, score, status removed as unused
         
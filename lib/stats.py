@@ -3,68 +3,222 @@ import sys
 import math
 import statistics
 import json
+import warnings
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# Samples shorter than this stay on the stdlib path. stats.py usually runs
+# once per comparison on tens of values, and importing NumPy (~70ms) costs
+# about as much as the stdlib code spends on ~25k values.
+NUMPY_MIN_SIZE = 25000
+
+# Samples at least this long are handed to the Numba kernels in
+# stats_kernels.py. Importing numba and loading the cached kernel costs
+# ~0.6s per process, which NumPy reductions only lose beyond ~10M values.
+KERNEL_MIN_SIZE = 10000000
+
+# NumPy and the optional accelerators built on it are imported on first use
+np = None
+_native = None
+_numpy_loaded = False
+
+def _load_numpy():
+    """Imports NumPy, plus stats_native when present; returns np or None."""
+    global np, _native, _numpy_loaded
+    if _numpy_loaded:
+        return np
+    _numpy_loaded = True
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    # Ahead-of-time compiled kernels from build_stats_native.py (`make native`);
+    # they need no JIT warm-up and link against NumPy
+    try:
+        if __package__:
+            from . import stats_native as _native
+        else:
+            import stats_native as _native
+    except ImportError:
+        pass
+    return np
+
+def _use_numpy(n):
+    """Returns True when an n-sized sample should take the NumPy path."""
+    return n >= NUMPY_MIN_SIZE and _load_numpy() is not None
+
+_kernels = None
+
+def _kernels_for(n):
+    """Returns a module providing moments4 for an n-sized sample, or None.
+
+    The prebuilt stats_native extension is preferred. Otherwise
+    stats_kernels is imported on first use for samples of KERNEL_MIN_SIZE
+    or more. None is returned for samples on the stdlib path and whenever
+    Numba is not installed.
+    """
+    global _kernels
+    if not _use_numpy(n):
+        return None
+    if _native is not None:
+        return _native
+    if n < KERNEL_MIN_SIZE:
+        return None
+    if _kernels is None:
+        try:
+            if __package__:
+                from . import stats_kernels as kernels
+            else:
+                import stats_kernels as kernels
+        except ImportError:
+            kernels = False
+        _kernels = kernels
+    return _kernels or None
+
+def _percentile_indices(n):
+    """Returns the sorted-order indices of p90, p95 and p99."""
+    return int(0.90 * (n - 1)), int(0.95 * (n - 1)), int(0.99 * (n - 1))
 
 def calculate_stats(values):
-    """Returns basic stats for a sequence of numbers."""
-    if not values:
-        return [0.0] * 10
-    
+    """Returns basic stats for a sequence of numbers.
+
+    Order: mean, median, stdev, min, max, p90, p95, p99, ci_lower, ci_upper.
+    """
+    return _stats_and_variance(values)[0]
+
+def _stats_and_variance(values):
+    """Returns (calculate_stats(values), sample variance) from one pass over the data."""
     n = len(values)
-    mean = statistics.mean(values)
-    median = statistics.median(values)
+    if n == 0:
+        return [0.0] * 10, 0.0
     
-    if n > 1:
-        stdev = statistics.stdev(values)
-        variance = statistics.variance(values)
+    if _use_numpy(n):
+        # One contiguous float64 buffer; every reduction below is a C loop
+        arr = np.asarray(values, dtype=np.float64)
+        mean, variance = _mean_var(arr) if n > 1 else (float(arr[0]), 0.0)
+        min_val = arr.min()
+        max_val = arr.max()
+        stdev = math.sqrt(variance)
+        # O(N) selection of the median and percentile order statistics in
+        # one partition, instead of a full sort
+        k90, k95, k99 = _percentile_indices(n)
+        mid_lo, mid_hi = (n - 1) // 2, n // 2
+        part = np.partition(arr, [mid_lo, mid_hi, k90, k95, k99])
+        median = (part[mid_lo] + part[mid_hi]) / 2
+        p90, p95, p99 = part[k90], part[k95], part[k99]
     else:
-        stdev = 0.0
-        variance = 0.0
+        mean, variance = _mean_var(values) if n > 1 else (values[0], 0.0)
+        stdev = math.sqrt(variance)
+        median = statistics.median(values)
+            
+        min_val = min(values)
+        max_val = max(values)
         
-    min_val = min(values)
-    max_val = max(values)
-    
-    sorted_vals = sorted(values)
-    p90 = sorted_vals[int(0.90 * (n - 1))]
-    p95 = sorted_vals[int(0.95 * (n - 1))]
-    p99 = sorted_vals[int(0.99 * (n - 1))]
+        sorted_vals = sorted(values)
+        p90, p95, p99 = (sorted_vals[k] for k in _percentile_indices(n))
     
     # 95% Confidence Interval
     confidence_margin = 1.96 * (stdev / math.sqrt(n)) if n > 0 else 0.0
     ci_lower = mean - confidence_margin
     ci_upper = mean + confidence_margin
     
-    return [float(mean), float(median), float(stdev), float(min_val), float(max_val), 
-            float(p90), float(p95), float(p99), float(ci_lower), float(ci_upper)]
+    results = (mean, median, stdev, min_val, max_val, p90, p95, p99, ci_lower, ci_upper)
+    # Plain floats on every path, so callers never see NumPy scalars
+    return [float(x) for x in results], float(variance)
 
-def check_normality(values):
-    """Returns normality status and skew/kurtosis (D'Agostino's approach)."""
+def _central_moments(values):
+    """Returns (mean, M2, M3, M4): the mean and summed 2nd-4th central moments."""
+    kernels = _kernels_for(len(values))
+    if kernels is not None:
+        mean, m2, m3, m4 = kernels.moments4(np.asarray(values, dtype=np.float64))
+        return float(mean), float(m2), float(m3), float(m4)
+    
+    if _use_numpy(len(values)):
+        arr = np.asarray(values, dtype=np.float64)
+        # Shift by the first value so constant samples give exactly zero moments
+        shifted = arr - arr[0]
+        offset = shifted.mean()
+        d = shifted - offset
+        d2 = d * d
+        return (float(arr[0] + offset), float(d2.sum()),
+                float((d2 * d).sum()), float((d2 * d2).sum()))
+    
+    # Single pass with Welford's online update extended to M3/M4 (Terriberry, 2007)
+    mean = m2 = m3 = m4 = 0.0
+    for k, x in enumerate(values, 1):
+        delta = x - mean
+        delta_k = delta / k
+        delta_k2 = delta_k * delta_k
+        term1 = delta * delta_k * (k - 1)
+        mean += delta_k
+        m4 += term1 * delta_k2 * (k * k - 3 * k + 3) + 6 * delta_k2 * m2 - 4 * delta_k * m3
+        m3 += term1 * delta_k * (k - 2) - 3 * delta_k * m2
+        m2 += term1
+    return mean, m2, m3, m4
+
+Summary = namedtuple("Summary", ["n", "mean", "var", "skew", "kurt"])
+
+def summarize(values):
+    """Returns the Summary (n, mean, sample variance, skew, excess kurtosis) of values.
+
+    Every field comes from one _central_moments call, so a sample feeding
+    several tests is only walked once.
+    """
     n = len(values)
-    if n < 20:
-        return "insufficient_data", 0, 0
+    if n == 0:
+        return Summary(0, 0.0, 0.0, 0.0, 0.0)
     
-    mean = statistics.mean(values)
-    stdev = statistics.stdev(values)
-    if stdev == 0:
-        return "zero_variance", 0, 0
+    mean, m2, m3, m4 = _central_moments(values)
+    if n < 2 or m2 == 0:
+        return Summary(n, mean, 0.0, 0.0, 0.0)
     
-    z_scores = [(x - mean) / stdev for x in values]
-    skewness = sum(z**3 for z in z_scores) / n
+    variance = m2 / (n - 1)
+    # Moments are standardised by the sample (n - 1) stdev
+    stdev = math.sqrt(variance)
+    skewness = (m3 / n) / stdev**3
     # Excess kurtosis
-    kurtosis = (sum(z**4 for z in z_scores) / n) - 3
+    kurtosis = (m4 / n) / stdev**4 - 3
+    return Summary(n, mean, variance, skewness, kurtosis)
+
+def check_normality_from_summary(s):
+    """check_normality on a precomputed Summary."""
+    if s.n < 20:
+        return "insufficient_data", 0, 0
+    if s.var == 0:
+        return "zero_variance", 0, 0
     
-    is_normal = abs(skewness) <= 1.0 and abs(kurtosis) <= 2.0
+    is_normal = abs(s.skew) <= 1.0 and abs(s.kurt) <= 2.0
     status = "approximately_normal" if is_normal else "non_normal"
-    return status, skewness, kurtosis
+    return status, s.skew, s.kurt
 
-def welchs_t_test(v1, v2):
-    """Performs Welch's t-test for unequal variances."""
-    n1, n2 = len(v1), len(v2)
+def check_normality(values):
+    """Returns normality status and skew/kurtosis (D'Agostino's approach)."""
+    if len(values) < 20:
+        return "insufficient_data", 0, 0
+    return check_normality_from_summary(summarize(values))
+
+def _mean_var(values):
+    """Returns the mean and sample (n - 1) variance of at least two values."""
+    n = len(values)
+    if not _use_numpy(n):
+        # No xbar: variance() then derives the exact mean itself and the
+        # result stays correctly rounded, as the CLI variance column expects
+        return statistics.mean(values), statistics.variance(values)
+    
+    arr = np.asarray(values, dtype=np.float64)
+    kernels = _kernels_for(n)
+    if kernels is not None:
+        mean, m2, _, _ = kernels.moments4(arr)
+        return float(mean), float(m2) / (n - 1)
+    # Shift by the first value so constant samples give exactly zero variance
+    shifted = arr - arr[0]
+    return float(arr[0] + shifted.mean()), float(shifted.var(ddof=1))
+
+def welchs_t_test_from_precomputed(m1, s1_sq, n1, m2, s2_sq, n2):
+    """welchs_t_test on each sample's mean, sample variance and size."""
     if n1 < 2 or n2 < 2:
         return 0.0, 0.0, 0.0, "insufficient_data"
     
-    m1, m2 = statistics.mean(v1), statistics.mean(v2)
-    s1_sq, s2_sq = statistics.variance(v1), statistics.variance(v2)
-    
     se = math.sqrt((s1_sq / n1) + (s2_sq / n2))
     if se == 0:
         return 0.0, 0.0, 999.0, "zero_variance"
@@ -78,49 +232,38 @@ def welchs_t_test(v1, v2):
     
     return t_stat, df, 0.0, "success"
 
+def welchs_t_test_from_summary(s1, s2):
+    """welchs_t_test on precomputed Summary objects."""
+    return welchs_t_test_from_precomputed(s1.mean, s1.var, s1.n, s2.mean, s2.var, s2.n)
+
+def welchs_t_test(v1, v2):
+    """Performs Welch's t-test for unequal variances."""
+    if len(v1) < 2 or len(v2) < 2:
+        return 0.0, 0.0, 0.0, "insufficient_data"
+    return welchs_t_test_from_summary(summarize(v1), summarize(v2))
+
 def mann_whitney_u_test(v1, v2):
     """Performs Mann-Whitney U test with O(N log N) rank calculation."""
     n1, n2 = len(v1), len(v2)
     if n1 < 3 or n2 < 3:
         return 0, 0, "insufficient_data"
     
-    combined = sorted([(v, 1) for v in v1] + [(v, 2) for v in v2])
-    
-    # Calculate ranks with tie handling
-    ranks = [0] * (n1 + n2)
-    i = 0
-    while i < len(combined):
-        j = i
-        while j < len(combined) and combined[j][0] == combined[i][0]:
-            j += 1
-        
-        # Mean rank for the tie group
-        avg_rank = (i + 1 + j) / 2.0
-        for k in range(i, j):
-            # Extract original group and assign rank
-            # Note: we don't need to assign back to specific index if we just sum
-            pass
-        
-        # Optimization: sum ranks directly
-        # This part requires tracking which value belongs to which group
-        # Let's adjust the combined strategy
-        i = j
-
-    # Re-calculating R1 properly
-    combined = sorted([(v, 1) for v in v1] + [(v, 2) for v in v2])
-    r1_sum = 0
-    i = 0
-    while i < len(combined):
-        j = i
-        while j < len(combined) and combined[j][0] == combined[i][0]:
-            j += 1
-        avg_rank = (i + 1 + j) / 2.0
-        for k in range(i, j):
-            if combined[k][1] == 1:
-                r1_sum += avg_rank
-        i = j
+    if _use_numpy(n1 + n2):
+        # U1 counts the (x, y) pairs with x > y, ties counting half, so only
+        # v2 has to be sorted and no pooled ranking is needed
+        a = np.asarray(v1, dtype=np.float64)
+        b = np.sort(np.asarray(v2, dtype=np.float64))
+        below = np.searchsorted(b, a, side='left')
+        ties = np.searchsorted(b, a, side='right') - below
+        u1 = float(below.sum() + 0.5 * ties.sum())
+    else:
+        # Same pair count with bisect; no (value, group) tuples are built
+        b = sorted(v2)
+        u1 = 0.0
+        for x in v1:
+            below = bisect_left(b, x)
+            u1 += below + 0.5 * (bisect_right(b, x) - below)
         
-    u1 = r1_sum - (n1 * (n1 + 1)) / 2
     u2 = (n1 * n2) - u1
     u_stat = min(u1, u2)
     
@@ -151,29 +294,111 @@ def interpret_effect_size(effect):
     if abs_e < 0.8: return "medium"
     return "large"
 
-def t_to_pvalue(t, df):
-    # Simplified approximation matching Bash version's bins
-    abs_t = abs(t)
+# Binned p-value approximation matching the Bash version: each table maps
+# |stat| to a p-value by counting how many critical values it exceeds
+_T_BINS_LARGE_DF = (1.645, 1.96, 2.576, 3.5)
+_T_PS_LARGE_DF = (0.20, 0.10, 0.05, 0.01, 0.001)
+_T_BINS_SMALL_DF = (2.0, 3.0)
+_T_PS_SMALL_DF = (0.20, 0.05, 0.01)
+_Z_BINS = (1.28, 1.645, 1.96, 2.576, 3.291)
+_Z_PS = (0.50, 0.20, 0.10, 0.05, 0.01, 0.001)
+
+def t_to_pvalue(t, df, exact=False):
+    # Simplified approximation matching Bash version's bins; exact=True
+    # returns the two-sided Student's t p-value instead (requires SciPy)
+    if exact:
+        from scipy.special import stdtr
+        return float(2 * stdtr(df, -abs(t)))
     if df > 30:
-        if abs_t > 3.5: return 0.001
-        if abs_t > 2.576: return 0.01
-        if abs_t > 1.96: return 0.05
-        if abs_t > 1.645: return 0.10
-        return 0.20
+        return _T_PS_LARGE_DF[bisect_left(_T_BINS_LARGE_DF, abs(t))]
+    return _T_PS_SMALL_DF[bisect_left(_T_BINS_SMALL_DF, abs(t))]
+
+def z_to_pvalue(z, exact=False):
+    # Simplified approximation matching Bash version; exact=True returns
+    # the two-sided normal p-value, erfc(|z| / sqrt(2))
+    if exact:
+        return math.erfc(abs(z) / math.sqrt(2))
+    return _Z_PS[bisect_left(_Z_BINS, abs(z))]
+
+def _bin_indices(bins, values):
+    """np.searchsorted(bins, values), with NaN in the first bin like bisect_left."""
+    return np.where(np.isnan(values), 0, np.searchsorted(bins, values))
+
+def t_to_pvalue_vec(ts, dfs, exact=False):
+    """Vectorized t_to_pvalue over arrays of t statistics and degrees of freedom."""
+    _load_numpy()
+    abs_t = np.abs(np.asarray(ts, dtype=np.float64))
+    if exact:
+        from scipy.special import stdtr
+        return 2 * stdtr(np.asarray(dfs, dtype=np.float64), -abs_t)
+    large = np.asarray(_T_PS_LARGE_DF)[_bin_indices(_T_BINS_LARGE_DF, abs_t)]
+    small = np.asarray(_T_PS_SMALL_DF)[_bin_indices(_T_BINS_SMALL_DF, abs_t)]
+    return np.where(np.asarray(dfs) > 30, large, small)
+
+def z_to_pvalue_vec(zs, exact=False):
+    """Vectorized z_to_pvalue over an array of z-scores."""
+    _load_numpy()
+    abs_z = np.abs(np.asarray(zs, dtype=np.float64))
+    if exact:
+        from scipy.special import ndtr
+        return 2 * ndtr(-abs_z)
+    return np.asarray(_Z_PS)[_bin_indices(_Z_BINS, abs_z)]
+
+def hypothesis_test(v1, v2):
+    """Picks Welch's t-test or Mann-Whitney U by normality; returns the CLI result line."""
+    n1, n2 = len(v1), len(v2)
+    # Each sample's moments are computed once and shared by every test
+    sum1, sum2 = summarize(v1), summarize(v2)
+    s1_status, s1_skew, s1_kurt = check_normality_from_summary(sum1)
+    s2_status, s2_skew, s2_kurt = check_normality_from_summary(sum2)
+    
+    if s1_status == "approximately_normal" and s2_status == "approximately_normal":
+        t, df, _, status = welchs_t_test_from_summary(sum1, sum2)
+        p = t_to_pvalue(t, df)
+        effect = calculate_cohens_d(sum1.mean, sum2.mean, sum1.var, sum2.var, n1, n2)
+        return f"welch|{t:.6f}|{df:.6f}|{p:.6f}|{status}|{effect:.6f}|{s1_status}|{s2_status}"
+    
+    u, z, status = mann_whitney_u_test(v1, v2)
+    p = z_to_pvalue(z)
+    effect = calculate_rank_biserial(u, n1, n2)
+    return f"mann_whitney|{u:.6f}|{z:.6f}|{p:.6f}|{status}|{effect:.6f}|{s1_status}|{s2_status}"
+
+def _check_finite(values):
+    """Returns values, raising ValueError if any is NaN or infinite."""
+    if _use_numpy(len(values)):
+        finite = bool(np.isfinite(values).all())
     else:
-        if abs_t > 3.0: return 0.01
-        if abs_t > 2.0: return 0.05
-        return 0.20
-
-def z_to_pvalue(z):
-    # Simplified approximation matching Bash version
-    abs_z = abs(z)
-    if abs_z > 3.291: return 0.001
-    if abs_z > 2.576: return 0.01
-    if abs_z > 1.96: return 0.05
-    if abs_z > 1.645: return 0.10
-    if abs_z > 1.28: return 0.20
-    return 0.50
+        finite = all(map(math.isfinite, values))
+    if not finite:
+        raise ValueError("non-finite value in input")
+    return values
+
+def _as_values(seq):
+    """Converts a decoded JSON list of numbers to the engine's sample type."""
+    if _use_numpy(len(seq)):
+        return _check_finite(np.asarray(seq, dtype=np.float64))
+    return _check_finite([float(x) for x in seq])
+
+def _parse_values(text):
+    """Parses whitespace-separated finite numbers from CLI input."""
+    # Each value takes at least two characters (digit and separator), so
+    # shorter input cannot reach NUMPY_MIN_SIZE and never imports NumPy
+    if len(text) >= 2 * NUMPY_MIN_SIZE - 1 and _load_numpy() is not None:
+        if not text.strip():
+            # fromstring returns [-1.0] for whitespace-only input
+            return []
+        with warnings.catch_warnings():
+            # NumPy < 2 only warns on unparseable input; keep it a hard error
+            warnings.simplefilter("error", DeprecationWarning)
+            arr = np.fromstring(text, dtype=np.float64, sep=" ")
+        return _check_finite(arr if len(arr) >= NUMPY_MIN_SIZE else arr.tolist())
+    return _check_finite([float(x) for x in text.split()])
+
+def _batch_values(side):
+    """Parses one side of a hypothesis_test_batch line, a string of numbers or a list."""
+    if isinstance(side, str):
+        return _parse_values(side)
+    return _as_values(side)
 
 def main():
     if len(sys.argv) < 2:
@@ -184,39 +409,43 @@ def main():
     
     try:
         if cmd == "calculate_statistics":
-            data = [float(x) for x in sys.stdin.read().split()]
-            results = calculate_stats(data)
-            # Add variance at the end for internal use
-            v = statistics.variance(data) if len(data) > 1 else 0.0
-            results.append(float(v))
-            print("|".join(f"{x:.6f}" if isinstance(x, float) else str(x) for x in results))
+            data = _parse_values(sys.stdin.read())
+            # Add variance at the end for internal use; it comes from the
+            # same pass as the stdev instead of being recomputed
+            results, variance = _stats_and_variance(data)
+            print("|".join(f"{x:.6f}" for x in results) + f"|{variance:.6f}")
             
         elif cmd == "check_normality":
-            data = [float(x) for x in sys.stdin.read().split()]
+            data = _parse_values(sys.stdin.read())
             status, skew, kurt = check_normality(data)
             print(f"{status}|skew={skew:.4f}|kurt={kurt:.4f}")
             
         elif cmd == "hypothesis_test":
             raw_input = sys.stdin.read().split("---")
-            v1 = [float(x) for x in raw_input[0].split()]
-            v2 = [float(x) for x in raw_input[1].split()]
+            v1 = _parse_values(raw_input[0])
+            v2 = _parse_values(raw_input[1])
             
-            n1, n2 = len(v1), len(v2)
-            s1_status, s1_skew, s1_kurt = check_normality(v1)
-            s2_status, s2_skew, s2_kurt = check_normality(v2)
+            print(hypothesis_test(v1, v2))
             
-            if s1_status == "approximately_normal" and s2_status == "approximately_normal":
-                t, df, _, status = welchs_t_test(v1, v2)
-                p = t_to_pvalue(t, df)
-                m1, m2 = statistics.mean(v1), statistics.mean(v2)
-                v1_var, v2_var = statistics.variance(v1), statistics.variance(v2)
-                effect = calculate_cohens_d(m1, m2, v1_var, v2_var, n1, n2)
-                print(f"welch|{t:.6f}|{df:.6f}|{p:.6f}|{status}|{effect:.6f}|{s1_status}|{s2_status}")
-            else:
-                u, z, status = mann_whitney_u_test(v1, v2)
-                p = z_to_pvalue(z)
-                effect = calculate_rank_biserial(u, n1, n2)
-                print(f"mann_whitney|{u:.6f}|{z:.6f}|{p:.6f}|{status}|{effect:.6f}|{s1_status}|{s2_status}")
+        elif cmd == "hypothesis_test_batch":
+            # One comparison per NDJSON line, {"v1": "1 2 3", "v2": "4 5 6"}
+            # (JSON lists also work), so a whole report pays the interpreter
+            # and import cost only once
+            failed = False
+            for line in sys.stdin:
+                if not line.strip():
+                    continue
+                try:
+                    # strict=False lets raw tokens carry stray control
+                    # characters, such as \r from CRLF files, as before
+                    pair = json.loads(line, strict=False)
+                    print(hypothesis_test(_batch_values(pair["v1"]), _batch_values(pair["v2"])))
+                except Exception as e:
+                    # Still one output line per comparison so callers stay aligned
+                    print(f"ERROR|{str(e)}")
+                    failed = True
+            if failed:
+                sys.exit(1)
                 
     except Exception as e:
         print(f"ERROR|{str(e)}")
@@ -0,0 +1,37 @@
+"""Numba-compiled kernels for lib/stats.py.
+
+Importing this module requires numba; stats.py only loads it for large
+samples and falls back to NumPy/stdlib code when the import fails.
+"""
+import numpy as np
+from numba import njit
+
+@njit(cache=True, fastmath=True)
+def moments4(arr):
+    """Returns [mean, M2, M3, M4]: the mean and summed 2nd-4th central moments."""
+    n = arr.shape[0]
+    # Shift by the first value so constant samples give exactly zero moments
+    x0 = arr[0]
+    total = 0.0
+    for i in range(n):
+        total += arr[i] - x0
+    offset = total / float(n)
+
+    # Plain reductions (no loop-carried state besides the sums) so LLVM can
+    # vectorize them; an online Welford update would serialize on the mean.
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(n):
+        d = arr[i] - x0 - offset
+        d2 = d * d
+        m2 += d2
+        m3 += d2 * d
+        m4 += d2 * d2
+
+    out = np.empty(4)
+    out[0] = x0 + offset
+    out[1] = m2
+    out[2] = m3
+    out[3] = m4
+    return out
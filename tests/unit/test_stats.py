@@ -2,6 +2,9 @@ import unittest
 import sys
 import os
 import statistics
+import importlib.util
+import subprocess
+from unittest import mock
 
 # Add project root to path to import lib.stats
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
@@ -11,6 +14,9 @@ if project_root not in sys.path:
 # Import from lib directory
 from lib import stats
 
+HAVE_SCIPY = importlib.util.find_spec("scipy") is not None
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
 class TestStats(unittest.TestCase):
     def setUp(self):
         self.data1 = [1, 2, 3, 4, 5]
@@ -31,16 +37,56 @@ class TestStats(unittest.TestCase):
         status, skew, kurt = stats.check_normality(data)
         self.assertEqual(status, "approximately_normal")
 
+    def test_check_normality_skewed(self):
+        data = [1] * 20 + [100] * 2
+        status, skew, kurt = stats.check_normality(data)
+        self.assertEqual(status, "non_normal")
+        self.assertTrue(skew > 1.0)
+        self.assertTrue(kurt > 2.0)
+
+    def test_check_normality_zero_variance(self):
+        status, skew, kurt = stats.check_normality([0.1] * 25)
+        self.assertEqual(status, "zero_variance")
+
+    def test_summarize(self):
+        s = stats.summarize(self.data1)
+        self.assertEqual(s.n, 5)
+        self.assertAlmostEqual(s.mean, 3.0)
+        self.assertAlmostEqual(s.var, statistics.variance(self.data1))
+        self.assertAlmostEqual(s.skew, 0.0)
+
     def test_welchs_t_test(self):
         t, df, _, status = stats.welchs_t_test(self.data1, self.data2)
         self.assertEqual(status, "success")
         self.assertTrue(t < 0) # Data1 mean is much smaller than Data2
 
+    def test_welchs_t_test_from_precomputed(self):
+        m1, v1 = statistics.mean(self.data1), statistics.variance(self.data1)
+        m2, v2 = statistics.mean(self.data2), statistics.variance(self.data2)
+        t, df, _, status = stats.welchs_t_test_from_precomputed(m1, v1, 5, m2, v2, 5)
+        expected = stats.welchs_t_test(self.data1, self.data2)
+        self.assertEqual(status, "success")
+        self.assertAlmostEqual(t, expected[0])
+        self.assertAlmostEqual(df, expected[1])
+
     def test_mann_whitney_u_test(self):
         u, z, status = stats.mann_whitney_u_test(self.data1, self.data2)
         self.assertEqual(status, "success")
         self.assertEqual(u, 0.0) # No overlap, U should be 0
 
+    def test_mann_whitney_u_test_ties(self):
+        # Tied values share the mean of their ranks: R1 = 1 + 3 + 3 + 5.5
+        u, z, status = stats.mann_whitney_u_test([1, 2, 2, 3], [2, 3, 4, 5])
+        self.assertEqual(status, "success")
+        self.assertEqual(u, 2.5)
+
+    def test_hypothesis_test(self):
+        # Fewer than 20 points per sample falls back to Mann-Whitney
+        fields = stats.hypothesis_test(self.data1, self.data2).split("|")
+        self.assertEqual(fields[0], "mann_whitney")
+        self.assertEqual(fields[4], "success")
+        self.assertEqual(fields[6:], ["insufficient_data", "insufficient_data"])
+
     def test_pvalue_approximations(self):
         # Z-to-p
         self.assertEqual(stats.z_to_pvalue(2.0), 0.05)
@@ -48,5 +94,117 @@ class TestStats(unittest.TestCase):
         # T-to-p (df > 30)
         self.assertEqual(stats.t_to_pvalue(2.0, 40), 0.05)
 
+    def test_pvalue_exact(self):
+        self.assertAlmostEqual(stats.z_to_pvalue(1.96, exact=True), 0.05, places=4)
+        self.assertAlmostEqual(stats.z_to_pvalue(0.0, exact=True), 1.0)
+
+    @unittest.skipIf(not HAVE_SCIPY, "SciPy not installed")
+    def test_pvalue_exact_t(self):
+        self.assertAlmostEqual(stats.t_to_pvalue(2.0, 10, exact=True), 0.0734, places=4)
+        self.assertAlmostEqual(stats.t_to_pvalue(-2.0, 10, exact=True), 0.0734, places=4)
+
+    @unittest.skipIf(not HAVE_SCIPY, "SciPy not installed")
+    def test_pvalue_exact_vec(self):
+        zs = stats.z_to_pvalue_vec([1.96, 0.0], exact=True)
+        self.assertAlmostEqual(zs[0], 0.05, places=4)
+        self.assertAlmostEqual(zs[1], 1.0)
+        ts = stats.t_to_pvalue_vec([2.0, -2.0], [10, 10], exact=True)
+        self.assertAlmostEqual(ts[0], 0.0734, places=4)
+        self.assertAlmostEqual(ts[1], 0.0734, places=4)
+
+    @unittest.skipIf(stats._load_numpy() is None, "NumPy not installed")
+    def test_pvalue_approximations_vec(self):
+        # An undefined statistic lands in the first (least significant) bin
+        zs = [0.5, -2.0, 3.0, 1.96, float("nan"), float("nan")]
+        self.assertEqual(list(stats.z_to_pvalue_vec(zs)), [stats.z_to_pvalue(z) for z in zs])
+        dfs = [40, 40, 10, 10, 40, 10]
+        self.assertEqual(list(stats.t_to_pvalue_vec(zs, dfs)),
+                         [stats.t_to_pvalue(t, df) for t, df in zip(zs, dfs)])
+
+    def test_hypothesis_test_batch_cli(self):
+        good = '{"v1": "1 2 3 4 5 .5 007", "v2": [10, 20, 30, 40, 50]}'
+        bad = '{"v1": "1 2 nan", "v2": "4 5 6"}'
+        proc = subprocess.run(
+            [sys.executable, os.path.join(project_root, "lib", "stats.py"), "hypothesis_test_batch"],
+            input=f"{good}\n\n{bad}\n{good}\n", capture_output=True, text=True)
+        lines = proc.stdout.splitlines()
+        # One output line per comparison, blank input lines skipped
+        self.assertEqual(len(lines), 3)
+        expected = stats.hypothesis_test([1, 2, 3, 4, 5, 0.5, 7], self.data2)
+        self.assertEqual(lines[0], expected)
+        self.assertTrue(lines[1].startswith("ERROR|"))
+        self.assertEqual(lines[2], expected)
+        self.assertEqual(proc.returncode, 1)
+
+@unittest.skipIf(stats._load_numpy() is None, "NumPy not installed")
+class TestStatsBackends(unittest.TestCase):
+    """The stdlib and NumPy paths must give the same results."""
+
+    def setUp(self):
+        # Repeating values so the rank and tie handling is exercised
+        self.data1 = [(i * 37) % 11 + 0.5 for i in range(40)]
+        self.data2 = [(i * 13) % 7 + 2.5 for i in range(30)]
+
+    def on_each_backend(self, fn, *args):
+        """Returns fn(*args) on the stdlib path and on each installed NumPy-based path."""
+        results = []
+        with mock.patch.object(stats, "np", None):
+            results.append(fn(*args))
+        # A prebuilt stats_native would otherwise stand in for every kernel
+        with mock.patch.object(stats, "NUMPY_MIN_SIZE", 0), mock.patch.object(stats, "_native", None):
+            results.append(fn(*args))
+            if HAVE_NUMBA:
+                # Numba JIT moments4 from stats_kernels
+                with mock.patch.object(stats, "KERNEL_MIN_SIZE", 0):
+                    results.append(fn(*args))
+        return results
+
+    def assertSameResults(self, results):
+        for other in results[1:]:
+            self.assertEqual(len(other), len(results[0]))
+            for a, b in zip(results[0], other):
+                if isinstance(a, str):
+                    self.assertEqual(a, b)
+                else:
+                    self.assertAlmostEqual(a, b, places=9)
+
+    def test_mann_whitney_u_test(self):
+        self.assertSameResults(self.on_each_backend(stats.mann_whitney_u_test, self.data1, self.data2))
+
+    def test_mann_whitney_u_test_ties(self):
+        results = self.on_each_backend(stats.mann_whitney_u_test, [1, 2, 2, 3], [2, 3, 4, 5])
+        self.assertSameResults(results)
+        self.assertEqual([r[0] for r in results], [2.5] * len(results))
+
+    def test_summarize(self):
+        self.assertSameResults(self.on_each_backend(stats.summarize, self.data1))
+
+    def test_summarize_constant(self):
+        for s in self.on_each_backend(stats.summarize, [0.1] * 25):
+            self.assertEqual(s.var, 0.0)
+
+    def test_calculate_stats(self):
+        results = self.on_each_backend(stats.calculate_stats, self.data1)
+        self.assertSameResults(results)
+        # Same return type whichever path the sample size selects
+        self.assertEqual({type(r) for r in results}, {list})
+
+    def test_calculate_stats_constant(self):
+        for res in self.on_each_backend(stats.calculate_stats, [0.1] * 25):
+            self.assertEqual(res[2], 0.0) # Stdev
+
+    def test_native_kernel(self):
+        # The prebuilt extension from `make native` is used on every NumPy-path sample
+        if stats._native is None:
+            self.skipTest("stats_native not built (make native)")
+        for fn, data in ((stats.summarize, self.data1), (stats.calculate_stats, self.data1),
+                         (stats.summarize, [0.1] * 25)):
+            with mock.patch.object(stats, "np", None):
+                plain = fn(data)
+            with mock.patch.object(stats, "NUMPY_MIN_SIZE", 0):
+                self.assertIs(stats._kernels_for(len(data)), stats._native)
+                native = fn(data)
+            self.assertSameResults([plain, native])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,17 @@
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Headless rendering; never load a GUI backend
 import matplotlib.pyplot as plt
 import os
 import glob
 import sys
 
+try:
+    import pyarrow  # noqa: F401 -- enables pandas' multithreaded CSV parser
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
 def generate_charts(report_dir):
     # Find all result CSVs
     csv_files = glob.glob(os.path.join(report_dir, "results_*.csv"))
@@ -12,34 +20,43 @@ def generate_charts(report_dir):
         print(f"No CSV files found in {report_dir}")
         return
 
-    data = []
+    frames = []
     for f in csv_files:
         scenario = os.path.basename(f).replace("results_", "").replace(".csv", "")
-        df = pd.read_csv(f)
+        df = pd.read_csv(f, engine=CSV_ENGINE)
         if not df.empty:
-            avg_rps = df['rps'].mean()
-            p95_latency = df['p95'].mean()
-            data.append({'Scenario': scenario, 'Avg RPS': avg_rps, 'P95 Latency (ms)': p95_latency})
+            frames.append(df.assign(Scenario=scenario))
+
+    if not frames:
+        print(f"No result rows found in {report_dir}")
+        return
 
-    results_df = pd.DataFrame(data)
+    # One grouped aggregation over all scenarios instead of per-file means
+    results_df = (pd.concat(frames, ignore_index=True)
+                  .groupby('Scenario', sort=False)
+                  .agg(**{'Avg RPS': ('rps', 'mean'), 'P95 Latency (ms)': ('p95', 'mean')})
+                  .reset_index())
     
+    # Both charts are drawn on one Figure, cleared in between
+    fig, ax = plt.subplots(figsize=(10, 6))
+
     # Plot RPS
-    plt.figure(figsize=(10, 6))
-    plt.bar(results_df['Scenario'], results_df['Avg RPS'], color='skyblue')
-    plt.title('October CMS Performance: Average Requests Per Second')
-    plt.ylabel('RPS')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.savefig(os.path.join(report_dir, 'rps_comparison.png'))
+    ax.bar(results_df['Scenario'], results_df['Avg RPS'], color='skyblue')
+    ax.set_title('October CMS Performance: Average Requests Per Second')
+    ax.set_ylabel('RPS')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.savefig(os.path.join(report_dir, 'rps_comparison.png'))
     print(f"Created rps_comparison.png in {report_dir}")
     
     # Plot Latency
-    plt.figure(figsize=(10, 6))
-    plt.bar(results_df['Scenario'], results_df['P95 Latency (ms)'], color='salmon')
-    plt.title('October CMS Performance: P95 Latency (ms)')
-    plt.ylabel('Latency (ms)')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.savefig(os.path.join(report_dir, 'latency_comparison.png'))
+    ax.clear()
+    ax.bar(results_df['Scenario'], results_df['P95 Latency (ms)'], color='salmon')
+    ax.set_title('October CMS Performance: P95 Latency (ms)')
+    ax.set_ylabel('Latency (ms)')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.savefig(os.path.join(report_dir, 'latency_comparison.png'))
     print(f"Created latency_comparison.png in {report_dir}")
+    plt.close(fig)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1: